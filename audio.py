@@ -0,0 +1,257 @@
+import array
+import math
+import os
+import random
+import sys
+import time
+
+import pygame
+
+# --- AUDIO ENGINE ---
+# The mixer is opened with a small buffer so effects start within a few ms.
+# Every effect is synthesized once at load time into an in-memory Sound and
+# played on a fixed pool of channels, so a burst of shots or explosions never
+# loads, decodes or allocates anything in the game loop. Loading is a
+# generator so the game can keep drawing its loading screen in between.
+
+FREQUENCY = 44100
+BUFFER = 256          # samples per callback, ~5.8 ms at 44.1 kHz
+NUM_CHANNELS = 16
+LOOP_CHANNEL = 0      # reserved for the UFO hum
+
+# name: (priority, max simultaneous voices)
+EFFECTS = {
+    "shot": (1, 4),
+    "boss_hit": (1, 3),
+    "explosion": (2, 6),
+    "big_explosion": (3, 2),
+    "player_hit": (4, 1),
+    "powerup": (4, 1),
+}
+
+
+def configure_mixer():
+    """ Must run before pygame.init() / pygame.mixer.init() """
+    pygame.mixer.pre_init(FREQUENCY, -16, 2, BUFFER)
+
+
+# --- SYNTHESIS ---
+
+def _envelope(i, n, attack=0.01):
+    a = max(1, int(n * attack))
+    return i / a if i < a else (1 - (i - a) / (n - a)) ** 2
+
+
+def _synth_shot(rate, rng):
+    n = int(rate * 0.12)
+    out, phase = [], 0.0
+    for i in range(n):
+        freq = 1200 - 900 * i / n
+        phase += freq / rate
+        out.append((1 if phase % 1 < 0.5 else -1) * 0.35 * _envelope(i, n))
+    return out
+
+
+def _synth_noise_burst(rate, rng, length, cutoff, volume):
+    n = int(rate * length)
+    out, lp = [], 0.0
+    for i in range(n):
+        lp += cutoff * (rng.uniform(-1, 1) - lp)
+        out.append(lp * volume * _envelope(i, n, 0.005))
+    return out
+
+
+def _synth_boss_hit(rate, rng):
+    n = int(rate * 0.06)
+    return [math.sin(2 * math.pi * 880 * i / rate) * math.sin(2 * math.pi * 1370 * i / rate)
+            * 0.4 * _envelope(i, n) for i in range(n)]
+
+
+def _synth_player_hit(rate, rng):
+    noise = _synth_noise_burst(rate, rng, 0.6, 0.15, 1.6)
+    return [s + math.sin(2 * math.pi * 70 * i / rate) * 0.4 * _envelope(i, len(noise))
+            for i, s in enumerate(noise)]
+
+
+def _synth_powerup(rate, rng):
+    out = []
+    for freq in (523, 659, 784, 1047):
+        n = int(rate * 0.07)
+        out.extend(math.sin(2 * math.pi * freq * i / rate) * 0.3 * _envelope(i, n) for i in range(n))
+    return out
+
+
+def _synth_ufo(rate, rng):
+    # Whole number of LFO cycles so the loop point is seamless
+    n = int(rate * 0.5)
+    out, phase = [], 0.0
+    for i in range(n):
+        freq = 420 + 120 * math.sin(2 * math.pi * 4 * i / n)
+        phase += freq / rate
+        out.append(math.sin(2 * math.pi * phase) * 0.2)
+    return out
+
+
+SYNTHS = {
+    "shot": _synth_shot,
+    "boss_hit": _synth_boss_hit,
+    "explosion": lambda rate, rng: _synth_noise_burst(rate, rng, 0.45, 0.25, 1.8),
+    "big_explosion": lambda rate, rng: _synth_noise_burst(rate, rng, 0.9, 0.08, 2.5),
+    "player_hit": _synth_player_hit,
+    "powerup": _synth_powerup,
+    "ufo": _synth_ufo,
+}
+LOAD_STEPS = len(SYNTHS) + 1  # mixer open + one per effect
+
+
+def _to_sound(samples, channels):
+    pcm = array.array("h", (int(max(-1.0, min(1.0, s)) * 32767) for s in samples for _ in range(channels)))
+    if sys.byteorder == "big":
+        pcm.byteswap()  # the mixer uses native-endian samples
+    return pygame.mixer.Sound(buffer=pcm.tobytes())
+
+
+class AudioEngine:
+    """ Pre-synthesized effects on a pooled set of mixer channels """
+    def __init__(self):
+        self.enabled = False
+        self.sounds = {}
+        self.channels = []
+        self.voices = []  # per channel: (priority, start order, effect name) or None
+        self.loop_playing = False
+        self.order = 0
+        self.plays = 0
+        self.steals = 0
+        self.drops = 0
+        self.peak_voices = 0
+        self.load_time = 0.0
+
+    def load(self):
+        """ Opens the mixer, then synthesizes one effect per step (LOAD_STEPS
+        in total). Each effect can play as soon as its step is done. """
+        start = time.perf_counter()
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(FREQUENCY, -16, 2, BUFFER)
+        except pygame.error as e:
+            print(f"Sound disabled: {e}")
+            return
+        rate, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            print(f"Sound disabled: unsupported mixer sample size {size}")
+            return
+
+        pygame.mixer.set_num_channels(NUM_CHANNELS)
+        pygame.mixer.set_reserved(LOOP_CHANNEL + 1)
+        self.channels = [pygame.mixer.Channel(i) for i in range(NUM_CHANNELS)]
+        self.voices = [None] * NUM_CHANNELS
+        self.enabled = True
+        self.load_time += time.perf_counter() - start
+        yield
+
+        rng = random.Random(1)
+        for name, synth in SYNTHS.items():
+            start = time.perf_counter()
+            self.sounds[name] = _to_sound(synth(rate, rng), channels)
+            self.load_time += time.perf_counter() - start
+            yield
+
+    def play(self, name):
+        """ Plays an effect, stealing the least important voice if the pool is full """
+        sound = self.sounds.get(name)
+        if sound is None: return
+        priority, max_voices = EFFECTS[name]
+        self.plays += 1
+
+        free = None
+        victim = None    # lowest priority, then oldest, voice we may replace
+        same = []        # voices already playing this effect
+        active = 0
+        for i in range(LOOP_CHANNEL + 1, NUM_CHANNELS):
+            voice = self.voices[i]
+            if voice is None or not self.channels[i].get_busy():
+                self.voices[i] = None
+                if free is None: free = i
+                continue
+            active += 1
+            if voice[2] == name:
+                same.append(i)
+            if voice[0] <= priority and (victim is None or voice[:2] < self.voices[victim][:2]):
+                victim = i
+
+        if len(same) >= max_voices:
+            # Retrigger the oldest copy instead of piling up more of the same
+            free = min(same, key=lambda i: self.voices[i][1])
+            self.steals += 1
+        elif free is None:
+            if victim is None:
+                self.drops += 1
+                return
+            free = victim
+            self.steals += 1
+        else:
+            active += 1
+
+        self.channels[free].play(sound)
+        self.voices[free] = (priority, self.order, name)
+        self.order += 1
+        self.peak_voices = max(self.peak_voices, active + self.loop_playing)
+
+    def set_loop(self, playing):
+        """ Starts or stops the UFO hum on its reserved channel """
+        if "ufo" not in self.sounds or playing == self.loop_playing: return
+        self.loop_playing = playing
+        if playing:
+            self.channels[LOOP_CHANNEL].play(self.sounds["ufo"], loops=-1)
+        else:
+            self.channels[LOOP_CHANNEL].fadeout(100)
+
+    def stop(self):
+        if self.enabled:
+            pygame.mixer.stop()
+            self.loop_playing = False
+
+    def latency_ms(self):
+        if not self.enabled: return 0.0
+        return BUFFER / pygame.mixer.get_init()[0] * 1000
+
+    def stats(self):
+        busy = sum(1 for ch in self.channels if ch.get_busy())
+        return {
+            "enabled": self.enabled,
+            "driver": os.environ.get("SDL_AUDIODRIVER", "default"),
+            "latency_ms": self.latency_ms(),
+            "load_ms": self.load_time * 1000,
+            "voices": busy,
+            "peak_voices": self.peak_voices,
+            "channels": len(self.channels),
+            "plays": self.plays,
+            "steals": self.steals,
+            "drops": self.drops,
+        }
+
+    def report(self):
+        s = self.stats()
+        if not s["enabled"]: return "Audio: disabled"
+        return (f"Audio: {s['latency_ms']:.1f} ms mixer buffer, effects synthesized in {s['load_ms']:.0f} ms, "
+                f"{s['peak_voices']}/{s['channels']} peak voices, {s['plays']} plays, "
+                f"{s['steals']} stolen, {s['drops']} dropped")
+
+
+if __name__ == "__main__":
+    # Headless check: python audio.py (uses SDL's dummy driver unless one is set)
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    configure_mixer()
+    engine = AudioEngine()
+    for _ in engine.load(): pass
+    print(engine.report())
+
+    names = list(EFFECTS)
+    start = time.perf_counter()
+    for i in range(2000):
+        engine.play(names[i % len(names)] if i % 3 else "shot")
+    elapsed = time.perf_counter() - start
+    engine.set_loop(True)
+    print(engine.report())
+    print(f"Burst of 2000 plays: {elapsed / 2000 * 1e6:.1f} us per play")
+    pygame.quit()
@@ -0,0 +1,274 @@
+import argparse
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import pygame
+
+# --- FRAME CAPTURE ---
+# Grabs the display surface every Nth frame and hands it to a background
+# writer thread. The game loop never waits on disk: if the queue is full the
+# frame is dropped and counted instead. PNGs are named by game frame number,
+# and frames.csv lists the game frame and time of every frame on disk, so
+# drops show up as gaps instead of silently speeding up playback.
+#
+# PNGs are written by hand rather than with pygame.image.save, which holds
+# the GIL for the whole encode (~180 ms a frame) and stalls the game loop.
+# Here the only heavy step is zlib.compress, which releases the GIL.
+
+# ffmpeg pixel format names for the common 32-bit display layouts
+RAW_PIXEL_FORMATS = {
+    (0xff0000, 0xff00, 0xff, 0): "bgr0",
+    (0xff0000, 0xff00, 0xff, 0xff000000): "bgra",
+    (0xff, 0xff00, 0xff0000, 0): "rgb0",
+    (0xff, 0xff00, 0xff0000, 0xff000000): "rgba",
+}
+
+PNG_LEVEL = 1  # fast zlib level; the writer must keep up with the game
+
+
+def _png_chunk(kind, data):
+    return struct.pack("!I", len(data)) + kind + data + struct.pack("!I", zlib.crc32(kind + data))
+
+
+def encode_png(data, size, bitsize, masks, pitch):
+    """ Encodes raw display surface bytes as an RGB PNG """
+    w, h = size
+    bpp = bitsize // 8
+    if bpp not in (3, 4):
+        raise ValueError(f"Unsupported display depth: {bitsize} bits")
+    # Byte offset of each colour channel inside a pixel
+    offsets = []
+    for mask in masks[:3]:
+        shift = mask.bit_length() - 8
+        offsets.append(shift // 8 if sys.byteorder == "little" else bpp - 1 - shift // 8)
+
+    row = w * bpp
+    if pitch != row:
+        data = b"".join(data[y * pitch:y * pitch + row] for y in range(h))
+    rgb = bytearray(w * h * 3)
+    for channel, offset in enumerate(offsets):
+        rgb[channel::3] = data[offset::bpp]
+
+    # Each scanline gets a leading filter byte (0 = none)
+    line = w * 3
+    scanlines = bytearray((line + 1) * h)
+    for y in range(h):
+        start = y * (line + 1) + 1
+        scanlines[start:start + line] = rgb[y * line:(y + 1) * line]
+
+    header = struct.pack("!IIBBBBB", w, h, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header) +
+            _png_chunk(b"IDAT", zlib.compress(bytes(scanlines), PNG_LEVEL)) +
+            _png_chunk(b"IEND", b""))
+
+
+class FrameRecorder:
+    """ Records gameplay frames to an image sequence or a raw video stream """
+    def __init__(self, out_dir, fmt="png", every=1, queue_size=32, fps=60):
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"Unknown capture format: {fmt}")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.every = max(1, int(every))
+        self.fps = fps
+        os.makedirs(out_dir, exist_ok=True)
+
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.frame_count = 0      # frames seen by capture()
+        self.captured = 0         # frames queued for writing
+        self.written = 0          # frames on disk
+        self.dropped = 0          # frames lost because the writer fell behind
+        self.dropped_frames = []  # game frame numbers of the dropped frames
+        self.capture_time = 0.0   # seconds spent inside capture()
+        # Wall-clock time between capture() calls, i.e. the game's frame time
+        # while recording. This is what shows a stalled loop; capture_time
+        # alone misses anything the writer does to the main thread.
+        self.last_frame = None
+        self.frame_time = 0.0
+        self.worst_frame = 0.0
+        self.slow_frames = 0      # frames that took over 1.5x the frame budget
+        self.surface_info = None
+        self.raw_file = None
+        self.start_time = time.perf_counter()
+        self.index_file = open(os.path.join(out_dir, "frames.csv"), "w")
+        self.index_file.write("frame,time_ms,file\n")
+
+        self.worker = threading.Thread(target=self._write_loop, name="FrameRecorder", daemon=True)
+        self.worker.start()
+
+    def capture(self, surface):
+        """ Called once per game frame, after drawing. Never blocks. """
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            elapsed = now - self.last_frame
+            self.frame_time += elapsed
+            self.worst_frame = max(self.worst_frame, elapsed)
+            if elapsed > 1.5 / self.fps:
+                self.slow_frames += 1
+        self.last_frame = now
+        self.frame_count += 1
+        if (self.frame_count - 1) % self.every:
+            return
+
+        frame_no = self.frame_count - 1
+        start = time.perf_counter()
+        if self.surface_info is None:
+            self.surface_info = (surface.get_size(), surface.get_bitsize(),
+                                 surface.get_masks(), surface.get_pitch())
+
+        if self.frames.full():
+            self._drop(frame_no)
+        else:
+            # The buffer proxy is a view on the surface pixels, so the only
+            # copy made here is the one snapshot the writer needs, since the
+            # display surface is redrawn next frame.
+            view = surface.get_buffer()
+            data = view.raw
+            del view  # releases the surface lock
+            try:
+                self.frames.put_nowait((frame_no, (start - self.start_time) * 1000, data))
+                self.captured += 1
+            except queue.Full:
+                self._drop(frame_no)
+        self.capture_time += time.perf_counter() - start
+
+    def _drop(self, frame_no):
+        self.dropped += 1
+        self.dropped_frames.append(frame_no)
+
+    def _write_loop(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            frame_no, time_ms, data = item
+            try:
+                if self.fmt == "png":
+                    name = self._write_png(frame_no, data)
+                else:
+                    name = self._write_raw(data)
+                self.index_file.write(f"{frame_no},{time_ms:.1f},{name}\n")
+                self.written += 1
+            except Exception as e:
+                print(f"Capture write failed: {e}")
+
+    def _write_png(self, frame_no, data):
+        png = encode_png(data, *self.surface_info)
+        name = f"frame_{frame_no:06d}.png"
+        with open(os.path.join(self.out_dir, name), "wb") as f:
+            f.write(png)
+        return name
+
+    def _write_raw(self, data):
+        if self.raw_file is None:
+            self.raw_file = open(os.path.join(self.out_dir, "capture.raw"), "wb")
+            self._write_info()
+        self.raw_file.write(data)
+        return f"capture.raw#{self.written}"
+
+    def _write_info(self):
+        """ capture.txt: stream layout, plus the drop summary once recording stops """
+        with open(os.path.join(self.out_dir, "capture.txt"), "w") as f:
+            if self.surface_info:
+                (w, h), bitsize, masks, pitch = self.surface_info
+                pix_fmt = RAW_PIXEL_FORMATS.get(tuple(masks), "unknown") if bitsize == 32 else "unknown"
+                f.write(f"format={self.fmt}\nsize={w}x{h}\nbits={bitsize}\npitch={pitch}\npix_fmt={pix_fmt}\n")
+            f.write(f"fps={self.fps / self.every:g}\nevery={self.every}\n")
+            f.write(f"written={self.written}\ndropped={self.dropped}\n")
+            f.write(f"dropped_frames={','.join(map(str, self.dropped_frames))}\n")
+            if self.fmt == "raw" and self.surface_info:
+                f.write("# fps only holds when dropped=0; frames.csv gives the real time of each frame\n")
+                f.write(f"# ffmpeg -f rawvideo -pixel_format {pix_fmt} -video_size {w}x{h} "
+                        f"-framerate {self.fps / self.every:g} -i capture.raw capture.mkv\n")
+
+    def stats(self):
+        sampled = self.captured + self.dropped
+        intervals = self.frame_count - 1
+        return {
+            "frames": self.frame_count,
+            "captured": self.captured,
+            "written": self.written,
+            "dropped": self.dropped,
+            "capture_call_ms": (self.capture_time / sampled * 1000) if sampled else 0.0,
+            "avg_frame_ms": (self.frame_time / intervals * 1000) if intervals > 0 else 0.0,
+            "worst_frame_ms": self.worst_frame * 1000,
+            "slow_frames": self.slow_frames,
+        }
+
+    def close(self):
+        """ Flushes queued frames, stops the writer and returns the stats """
+        self.frames.put(None)
+        self.worker.join()
+        if self.raw_file:
+            self.raw_file.close()
+            self.raw_file = None
+        self.index_file.close()
+        self._write_info()
+        return self.stats()
+
+    def report(self):
+        s = self.stats()
+        return (f"Capture: {s['written']}/{s['captured']} frames written, {s['dropped']} dropped; "
+                f"frame time {s['avg_frame_ms']:.1f} ms avg, {s['worst_frame_ms']:.1f} ms worst, "
+                f"{s['slow_frames']} over budget ({s['capture_call_ms']:.3f} ms in capture())")
+
+
+def _bench_run(g, fmt, frames, out_dir):
+    """ Runs the real game loop for some frames; returns (fps, worst frame ms, recorder) """
+    game = g.Game()
+    recorder = FrameRecorder(os.path.join(out_dir, fmt), fmt=fmt) if fmt != "off" else None
+    times = []
+    g.clock.tick()
+    start = last = time.perf_counter()
+    for _ in range(frames):
+        g.clock.tick(60)
+        pygame.event.pump()
+        game.update()
+        game.draw()
+        if recorder: recorder.capture(g.screen)
+        now = time.perf_counter()
+        times.append(now - last)
+        last = now
+    fps = frames / (time.perf_counter() - start)
+    if recorder: recorder.close()
+    return fps, max(times[1:]) * 1000, recorder
+
+
+def run_bench(frames):
+    """ Plays the game headless with capture off, png and raw; fails if capture
+    pushes the loop below 60 fps or gives it frames over 1.5x the budget """
+    import tempfile
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.argv = sys.argv[:1]  # game.py parses the command line on import
+    import game as g
+    for _ in g.load_assets(sound=False): pass
+
+    budget_ms = 1000 / 60
+    ok = True
+    with tempfile.TemporaryDirectory() as out_dir:
+        base_fps, base_worst, _ = _bench_run(g, "off", frames, out_dir)
+        print(f"{'off':<4} {base_fps:6.1f} fps, worst frame {base_worst:6.1f} ms")
+        for fmt in ("png", "raw"):
+            fps, worst, recorder = _bench_run(g, fmt, frames, out_dir)
+            s = recorder.stats()
+            over = fps < 0.95 * base_fps or worst > 1.5 * budget_ms
+            ok = ok and not over
+            print(f"{fmt:<4} {fps:6.1f} fps, worst frame {worst:6.1f} ms, "
+                  f"+{1000 / fps - 1000 / base_fps:.2f} ms/frame vs off, "
+                  f"{s['written']} written, {s['dropped']} dropped" + ("  OVER BUDGET" if over else ""))
+    pygame.quit()
+    return ok
+
+
+if __name__ == "__main__":
+    # Headless frame budget check: python capture.py [--frames N]
+    parser = argparse.ArgumentParser(description="Frame time with capture off / png / raw")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    sys.exit(0 if run_bench(args.frames) else 1)
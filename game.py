@@ -1,11 +1,37 @@
+import time
+START_TIME = time.time()
+
 import pygame
 import random
 import os
 import sys
 import math
+import argparse
+import audio
+
+# --- COMMAND LINE ---
+parser = argparse.ArgumentParser(description="Space Invaders: COMMANDER")
+parser.add_argument("--capture", metavar="DIR", help="record gameplay frames into DIR")
+parser.add_argument("--capture-format", choices=["png", "raw"], default="png",
+                    help="png image sequence or a single raw video stream")
+parser.add_argument("--capture-every", type=int, default=1, metavar="N", help="record every Nth frame")
+parser.add_argument("--spectate", type=int, nargs="?", const=7777, metavar="PORT",
+                    help="stream game state to spectators on TCP PORT (default 7777)")
+parser.add_argument("--spectate-host", default="127.0.0.1", metavar="HOST",
+                    help="address to accept spectators on, e.g. 0.0.0.0 for other machines (default 127.0.0.1)")
+parser.add_argument("--spectate-unix", metavar="PATH", help="stream game state on a Unix socket")
+parser.add_argument("--no-sound", action="store_true", help="disable sound effects")
+parser.add_argument("--audio-stats", action="store_true", help="print mixer latency and voice usage on exit")
+parser.add_argument("--startup-report", action="store_true",
+                    help="print startup timestamps and quit after the first game frame")
 
 # --- INITIALIZATION ---
-pygame.init()
+# Only the subsystems the game uses: the mixer is opened by the audio engine
+# while assets load, and joystick and the rest are never started.
+audio.configure_mixer()
+pygame.display.init()
+pygame.font.init()
+pygame.time.delay(1)  # starts SDL's timer, which pygame.time.get_ticks() needs
 
 # --- EXE COMPATIBILITY SETUP ---
 def resource_path(relative_path):
@@ -20,8 +46,14 @@ WIDTH, HEIGHT = 800, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Space Invaders: COMMANDER")
 clock = pygame.time.Clock()
-font = pygame.font.Font(None, 36)
-big_font = pygame.font.Font(None, 72)
+
+fonts = {}
+
+def get_font(size):
+    """ Fonts are created on first use and cached """
+    if size not in fonts:
+        fonts[size] = pygame.font.Font(None, size)
+    return fonts[size]
 
 # --- HIGH SCORE SYSTEM ---
 HIGHSCORE_FILE = "highscore.txt"
@@ -47,24 +79,43 @@ def load_sprite(filename, size, remove_black=True):
     img = pygame.image.load(path)
     if remove_black:
         img = img.convert_alpha()
-        w, h = img.get_size()
-        for x in range(w):
-            for y in range(h):
-                if img.get_at((x, y))[:3] == (0, 0, 0):
-                    img.set_at((x, y), (0, 0, 0, 0))
+        # Pure black pixels (any alpha) become fully transparent
+        black = pygame.mask.from_threshold(img, (0, 0, 0, 128), (1, 1, 1, 255))
+        cutout = black.to_surface(setcolor=(0, 0, 0, 0), unsetcolor=(255, 255, 255, 255))
+        img.blit(cutout, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
     else:
         img = img.convert() 
     return pygame.transform.smoothscale(img, size)
 
-# Load Assets
-bg_img = load_sprite("background.png", (WIDTH, HEIGHT), remove_black=False)
-player_img = load_sprite("spaceship.png", (50, 50), remove_black=True)
-enemy_img = load_sprite("enemy.png", (40, 30), remove_black=True)
-boss_img = load_sprite("Boss.png", (150, 100), remove_black=True)
-
-if not boss_img:
-    boss_img = pygame.Surface((150, 100), pygame.SRCALPHA)
-    pygame.draw.polygon(boss_img, (150, 0, 0), [(75, 100), (0, 0), (150, 0)])
+# Assets are filled in by load_assets() once the window is up
+bg_img = None
+player_img = None
+enemy_img = None
+boss_img = None
+
+# Sound effects
+sfx = audio.AudioEngine()
+
+def load_assets(sound=True):
+    """ Loads one asset per step, yielding (done, total) so the caller can draw progress """
+    global bg_img, player_img, enemy_img, boss_img
+    total = 4 + (audio.LOAD_STEPS if sound else 0)
+
+    bg_img = load_sprite("background.png", (WIDTH, HEIGHT), remove_black=False)
+    yield 1, total
+    player_img = load_sprite("spaceship.png", (50, 50), remove_black=True)
+    yield 2, total
+    enemy_img = load_sprite("enemy.png", (40, 30), remove_black=True)
+    yield 3, total
+    boss_img = load_sprite("Boss.png", (150, 100), remove_black=True)
+    if not boss_img:
+        boss_img = pygame.Surface((150, 100), pygame.SRCALPHA)
+        pygame.draw.polygon(boss_img, (150, 0, 0), [(75, 100), (0, 0), (150, 0)])
+    yield 4, total
+
+    if sound:
+        for done, _ in enumerate(sfx.load(), 5):
+            yield done, total
 
 # Dark overlay
 dark_overlay = pygame.Surface((WIDTH, HEIGHT))
@@ -142,11 +193,11 @@ class Enemy:
         self.vx = 0
         self.vy = 0
 
-    def update(self, fleet_speed, fleet_dir, ship_x, ship_y):
+    def update(self, fleet_speed, fleet_dir, ship_x, ship_y, wave_ticks):
         if self.state == "formation":
             self.rect.x += fleet_speed * fleet_dir
             # Wave Movement
-            time_factor = pygame.time.get_ticks() / 300 
+            time_factor = wave_ticks / 300 
             wave_offset = math.sin(time_factor + self.rect.x * 0.02) * 15
             self.rect.y = self.row_y + wave_offset
 
@@ -221,7 +272,7 @@ class PowerUp:
         elif self.type == 'shield': color = (0, 100, 255); char = "S"
         else: color = (0, 255, 100); char = ">>"
         pygame.draw.rect(surface, color, self.rect, border_radius=4)
-        surface.blit(pygame.font.Font(None,20).render(char, True, (0,0,0)), (self.rect.x+4, self.rect.y+4))
+        surface.blit(get_font(20).render(char, True, (0,0,0)), (self.rect.x+4, self.rect.y+4))
 
 # --- GAME ENGINE ---
 
@@ -246,6 +297,8 @@ class Game:
         self.speed_boost_active = False
         self.ability_timer = 0
         self.shake_timer = 0 # Screen shake
+        self.explosions = [] # Explosions created this tick (for spectators)
+        self.wave_ticks = 0
         self.setup_player()
         self.setup_level()
 
@@ -282,17 +335,25 @@ class Game:
                  pygame.Rect(self.ship_x + 38, self.ship_y + 10, 4, 10)
              ]
              self.bullets.extend(bullets_to_fire)
+             sfx.play("shot")
         else:
             if len(self.bullets) < 5:
                 self.bullets.append(pygame.Rect(self.ship_x + 23, self.ship_y, 4, 10))
+                sfx.play("shot")
 
     def create_explosion(self, x, y, color, intensity=1):
         """ Creates particles and a shockwave """
+        self.explosions.append((x, y, color, intensity))
+        if color == (255, 50, 50): sfx.play("player_hit")
+        elif intensity < 1: sfx.play("boss_hit")
+        elif intensity > 1: sfx.play("big_explosion")
+        else: sfx.play("explosion")
+
         # Shockwave Ring
         self.shockwaves.append(Shockwave(x, y, (255, 255, 255)))
         
         # Debris
-        count = 20 * intensity
+        count = int(20 * intensity)
         for _ in range(count):
             self.particles.append(Particle(x, y, color))
             
@@ -301,6 +362,8 @@ class Game:
             self.shake_timer = 10 * intensity
 
     def update(self):
+        self.explosions = []
+        sfx.set_loop(self.ufo is not None and not self.game_over)
         self.bg_y += 0.5  
         if self.bg_y >= HEIGHT: self.bg_y = 0
         
@@ -347,8 +410,9 @@ class Game:
                     diver.state = "diving"
 
             move_down = False
+            self.wave_ticks = pygame.time.get_ticks() # One wave phase for the whole fleet
             for enemy in self.enemies:
-                enemy.update(self.fleet_speed, self.fleet_direction, self.ship_x, self.ship_y)
+                enemy.update(self.fleet_speed, self.fleet_direction, self.ship_x, self.ship_y, self.wave_ticks)
                 if enemy.state == "formation":
                     if enemy.rect.right >= WIDTH or enemy.rect.left <= 0:
                         move_down = True
@@ -464,6 +528,7 @@ class Game:
                     self.ability_timer = 600
                 elif p.type == 'shield':
                     self.shield_active = True
+                sfx.play("powerup")
                 self.powerups.remove(p)
 
     def draw(self):
@@ -509,15 +574,15 @@ class Game:
         for s in self.shockwaves: s.draw(screen)
         for p in self.particles: p.draw(screen)
 
-        screen.blit(font.render(f"SCORE: {self.score}", True, (255, 255, 255)), (10, 10))
-        screen.blit(font.render(f"HI-SCORE: {self.high_score}", True, (255, 215, 0)), (300, 10))
-        screen.blit(font.render(f"LEVEL: {self.level}", True, (0, 255, 0)), (WIDTH - 130, 10))
+        screen.blit(get_font(36).render(f"SCORE: {self.score}", True, (255, 255, 255)), (10, 10))
+        screen.blit(get_font(36).render(f"HI-SCORE: {self.high_score}", True, (255, 215, 0)), (300, 10))
+        screen.blit(get_font(36).render(f"LEVEL: {self.level}", True, (0, 255, 0)), (WIDTH - 130, 10))
         
         if self.ability_timer > 0:
             if self.multishot_active:
-                screen.blit(font.render("MULTI-SHOT", True, (255, 255, 0)), (WIDTH//2 - 70, HEIGHT - 30))
+                screen.blit(get_font(36).render("MULTI-SHOT", True, (255, 255, 0)), (WIDTH//2 - 70, HEIGHT - 30))
             elif self.speed_boost_active:
-                screen.blit(font.render("SPEED BOOST", True, (0, 255, 100)), (WIDTH//2 - 70, HEIGHT - 30))
+                screen.blit(get_font(36).render("SPEED BOOST", True, (0, 255, 100)), (WIDTH//2 - 70, HEIGHT - 30))
 
         for i in range(self.lives):
             pygame.draw.polygon(screen, (200, 50, 50), [
@@ -525,33 +590,93 @@ class Game:
             ])
 
         if self.game_over:
-            over_text = big_font.render("GAME OVER", True, (255, 0, 0))
+            over_text = get_font(72).render("GAME OVER", True, (255, 0, 0))
             screen.blit(over_text, (WIDTH//2 - 150, HEIGHT//2 - 50))
-            restart_text = font.render("Press R to Restart", True, (200, 200, 200))
+            restart_text = get_font(36).render("Press R to Restart", True, (200, 200, 200))
             screen.blit(restart_text, (WIDTH//2 - 100, HEIGHT//2 + 20))
 
         pygame.display.flip()
 
-# --- MAIN LOOP ---
-game = Game()
-running = True
+# --- LOADING SCREEN ---
+def draw_loading(progress):
+    screen.fill((10, 10, 30))
+    text = get_font(36).render("LOADING...", True, (255, 255, 255))
+    screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 40))
+    pygame.draw.rect(screen, (50, 50, 50), (WIDTH//2 - 150, HEIGHT//2, 300, 12))
+    pygame.draw.rect(screen, (0, 255, 255), (WIDTH//2 - 150, HEIGHT//2, 300 * progress, 12))
+    pygame.display.flip()
 
-while running:
-    clock.tick(60)
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+# --- MAIN LOOP ---
+def main():
+    args, _ = parser.parse_known_args()
+    startup = {"start": START_TIME}
+
+    # Show a frame right away, then load assets one at a time behind it
+    draw_loading(0)
+    startup["first_frame"] = time.time()
+    for done, total in load_assets(sound=not args.no_sound):
+        if pygame.event.get(pygame.QUIT):
+            pygame.quit()
+            sys.exit()
+        draw_loading(done / total)
+    startup["loaded"] = time.time()
+
+    game = Game()
+    running = True
+
+    recorder = None
+    if args.capture:
+        from capture import FrameRecorder
+        recorder = FrameRecorder(args.capture, fmt=args.capture_format, every=args.capture_every)
+
+    server = None
+    if args.spectate is not None or args.spectate_unix:
+        from spectator import SpectatorServer
+        server = SpectatorServer(host=args.spectate_host, port=args.spectate,
+                                 unix_path=args.spectate_unix)
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Spectating disabled: {e}")
+            server = None
+
+    while running:
+        clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+                save_highscore(game.high_score)
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1: game.shoot()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE: game.shoot()
+                if event.key == pygame.K_r and game.game_over: game.reset_game()
+
+        game.update()
+        if server: server.publish(game)
+        game.draw()
+        if recorder: recorder.capture(screen)
+
+        if args.startup_report:
+            # Read by startup_report.py
+            startup["game_frame"] = time.time()
+            for name, stamp in startup.items():
+                print(f"startup {name} {stamp:.6f}")
             running = False
-            save_highscore(game.high_score)
-        
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1: game.shoot()
 
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE: game.shoot()
-            if event.key == pygame.K_r and game.game_over: game.reset_game()
+    if recorder:
+        recorder.close()
+        print(recorder.report())
+    if server:
+        server.stop()
+        print(server.report())
+    if args.audio_stats:
+        print(sfx.report())
 
-    game.update()
-    game.draw()
+    pygame.quit()
+    sys.exit()
 
-pygame.quit()
-sys.exit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
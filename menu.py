@@ -1,5 +1,7 @@
+import time
+START_TIME = time.time()
+
 import customtkinter as ctk
-import subprocess
 import sys
 import os
 import random
@@ -8,6 +10,8 @@ import random
 WIDTH, HEIGHT = 1000, 700
 NEON_PINK = "#ff00ff"
 NEON_CYAN = "#00ffff"
+LOGO_FONT = ("Arial Black", 64, "bold")
+STARTUP_REPORT = "--startup-report" in sys.argv  # print startup timestamps and quit
 
 ctk.set_appearance_mode("dark")
 
@@ -22,8 +26,9 @@ class SpaceInvadersMenu:
         self.canvas = ctk.CTkCanvas(self.root, width=WIDTH, height=HEIGHT, bg="black", highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
 
-        # Initialize Stars
-        self.stars = self.create_stars(100)
+        # Stars are added by load_scene() after the first paint
+        self.stars = []
+        self.startup = {"start": START_TIME}
         
         # Animation State
         self.pulse_alpha = 0
@@ -51,24 +56,52 @@ class SpaceInvadersMenu:
             size = random.randint(1, 3)
             speed = random.uniform(0.5, 3.0)
             item = self.canvas.create_oval(x, y, x+size, y+size, fill="white", outline="")
+            self.canvas.tag_lower(item)  # behind everything already drawn
             stars.append({'id': item, 'speed': speed, 'x': x, 'y': y, 'size': size})
         return stars
 
     def draw_retro_logo(self, x, y, text):
-        font_family = "Arial Black"
-        size = 64  
-        
+        # Top Layer only; shadows and scanlines are added by load_scene()
+        self.logo = (x, y, text)
+        self.logo_id = self.canvas.create_text(x, y, text=text, fill=NEON_PINK, font=LOGO_FONT)
+
+    def draw_logo_shadows(self):
+        x, y, text = self.logo
         # Shadow Layers (Retro 3D effect)
         for i in range(8, 0, -1):
             color = "#4a0072" if i > 4 else "#9400d3"
-            self.canvas.create_text(x + i, y + i, text=text, fill=color, font=(font_family, size, "bold"))
-        
-        # Top Layer
-        self.canvas.create_text(x, y, text=text, fill=NEON_PINK, font=(font_family, size, "bold"))
-        
-        # Scanlines
+            item = self.canvas.create_text(x + i, y + i, text=text, fill=color, font=LOGO_FONT)
+            self.canvas.tag_lower(item, self.logo_id)
+
+    def draw_logo_scanlines(self):
+        x, y, _ = self.logo
         for i in range(y - 40, y + 40, 4):
-            self.canvas.create_line(x - 280, i, x + 280, i, fill="black", stipple="gray25", width=1)
+            item = self.canvas.create_line(x - 280, i, x + 280, i, fill="black", stipple="gray25", width=1)
+            self.canvas.tag_raise(item, self.logo_id)
+
+    def load_scene(self):
+        """ Decorations, one chunk per step so the window stays responsive """
+        for _ in range(4):
+            self.stars.extend(self.create_stars(25))
+            yield
+        self.draw_logo_shadows()
+        yield
+        self.draw_logo_scanlines()
+
+    def load_step(self):
+        if not self.running: return
+        try:
+            next(self.loader)
+        except StopIteration:
+            self.startup["loaded"] = time.time()
+            if STARTUP_REPORT:
+                # Read by startup_report.py
+                for name, stamp in self.startup.items():
+                    print(f"startup {name} {stamp:.6f}")
+                self.running = False
+                self.root.destroy()
+            return
+        self.root.after(1, self.load_step)
 
     def draw_interface(self):
         self.draw_retro_logo(WIDTH//2, 200, "SPACE INVADERS")
@@ -141,6 +174,7 @@ class SpaceInvadersMenu:
             self.start_game()
 
     def start_game(self):
+        import subprocess
         self.running = False
         self.root.destroy()
         
@@ -171,6 +205,11 @@ class SpaceInvadersMenu:
         sys.exit()
 
     def run(self):
+        # Paint the essentials first, then fill in the rest of the scene
+        self.root.update()
+        self.startup["first_frame"] = time.time()
+        self.loader = self.load_scene()
+        self.root.after(1, self.load_step)
         self.root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,685 @@
+import argparse
+import asyncio
+import math
+import os
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+
+# --- SPECTATOR STREAMING ---
+# The running Game publishes one message per tick describing only what
+# changed since the previous tick. Every message is length-prefixed:
+#
+#   header  !BIH   kind (keyframe/delta), tick, section mask
+#   hud     !IIbHBhh  score, high score, lives, level, flags, ship x, ship y
+#   table   !HH    removed count, upsert count, then removed ids (!H each)
+#                  and upserts (!H id + the table's record struct)
+#   events  !B     explosion count, then !hhBBBB x, y, r, g, b, intensity*10
+#   fleet   !hhI   formation x step, row step, wave clock (deltas only)
+#
+# Entities get small wire ids when they first appear, so a delta only has to
+# name the ones that were added, moved or removed. Both sides first advance
+# the previous tick with predict(): bullets by their fixed speed, formation
+# enemies by the fleet step that the delta sends once. Only entities that end
+# up somewhere else are sent. A keyframe carries the full scene and clears
+# whatever the viewer had before.
+
+KEYFRAME, DELTA = 1, 2
+
+FRAME = struct.Struct("!I")
+HEADER = struct.Struct("!BIH")
+HUD = struct.Struct("!IIbHBhh")
+TABLE = struct.Struct("!HH")
+EVENT_COUNT = struct.Struct("!B")
+EXPLOSION = struct.Struct("!hhBBBB")
+FLEET = struct.Struct("!hhI")
+
+# name, record layout (without the id)
+TABLES = [
+    ("enemies", "hhhB"),        # x, y, row y, state
+    ("bullets", "hhBB"),        # x, y, w, h
+    ("enemy_bullets", "hhBB"),  # x, y, w, h
+    ("powerups", "hhB"),        # x, y, type
+    ("boss", "hhHH"),           # x, y, hp, max hp
+    ("ufo", "hh"),              # x, y
+]
+RECORDS = {name: struct.Struct("!H" + fmt) for name, fmt in TABLES}
+
+HUD_BIT = 1
+EVENTS_BIT = 1 << 7
+FLEET_BIT = 1 << 8
+TABLE_BITS = {name: 1 << (i + 1) for i, (name, _) in enumerate(TABLES)}
+
+FLAG_GAME_OVER, FLAG_SHIELD, FLAG_MULTISHOT, FLAG_SPEED = 1, 2, 4, 8
+ENEMY_STATES = ["formation", "diving"]
+POWERUP_TYPES = ["multi", "shield", "speed"]
+BULLET_SPEEDS = {"bullets": -10, "enemy_bullets": 5}  # pixels per tick, as in Game
+
+DEFAULT_PORT = 7777
+
+
+def _round(v):
+    # pygame.Rect rounds half away from zero when given a float
+    return int(v + 0.5) if v >= 0 else -int(0.5 - v)
+
+
+def predict_formation(record, fleet):
+    """ Where a formation enemy ends up after one fleet step (see Enemy.update) """
+    x, y, row_y, state = record
+    if state != 0:
+        return record
+    dx, row_dy, wave_ticks = fleet
+    x += dx
+    row_y += row_dy
+    return (x, _round(row_y + math.sin(wave_ticks / 300 + x * 0.02) * 15), row_y, state)
+
+
+def predict(entities, name, fleet):
+    """ The table as the viewer will have it after a delta, before corrections """
+    if name in BULLET_SPEEDS:
+        dy = BULLET_SPEEDS[name]
+        return {wid: (x, y + dy, w, h) for wid, (x, y, w, h) in entities.items()}
+    if name == "enemies" and fleet is not None:
+        return {wid: predict_formation(rec, fleet) for wid, rec in entities.items()}
+    return entities
+
+
+def encode_message(kind, tick, hud, tables, events, fleet=None):
+    """ tables maps a table name to (removed ids, [(id, record), ...]) """
+    mask = 0
+    body = []
+    if hud is not None:
+        mask |= HUD_BIT
+        body.append(HUD.pack(*hud))
+    if fleet is not None:
+        mask |= FLEET_BIT
+        body.append(FLEET.pack(*fleet))
+    for name, _ in TABLES:
+        removed, upserts = tables.get(name, ((), ()))
+        if not removed and not upserts and kind != KEYFRAME:
+            continue
+        mask |= TABLE_BITS[name]
+        body.append(TABLE.pack(len(removed), len(upserts)))
+        if removed:
+            body.append(struct.pack(f"!{len(removed)}H", *removed))
+        record = RECORDS[name]
+        for wid, rec in upserts:
+            body.append(record.pack(wid, *rec))
+    if events:
+        mask |= EVENTS_BIT
+        body.append(EVENT_COUNT.pack(len(events)))
+        for ev in events:
+            body.append(EXPLOSION.pack(*ev))
+    payload = HEADER.pack(kind, tick, mask) + b"".join(body)
+    return FRAME.pack(len(payload)) + payload
+
+
+def decode_message(payload):
+    """ Inverse of encode_message (without the length prefix) """
+    kind, tick, mask = HEADER.unpack_from(payload, 0)
+    offset = HEADER.size
+    hud = None
+    if mask & HUD_BIT:
+        hud = HUD.unpack_from(payload, offset)
+        offset += HUD.size
+    fleet = None
+    if mask & FLEET_BIT:
+        fleet = FLEET.unpack_from(payload, offset)
+        offset += FLEET.size
+    tables = {}
+    for name, _ in TABLES:
+        if not mask & TABLE_BITS[name]:
+            continue
+        n_removed, n_upserts = TABLE.unpack_from(payload, offset)
+        offset += TABLE.size
+        removed = struct.unpack_from(f"!{n_removed}H", payload, offset)
+        offset += 2 * n_removed
+        record = RECORDS[name]
+        upserts = []
+        for _ in range(n_upserts):
+            values = record.unpack_from(payload, offset)
+            upserts.append((values[0], values[1:]))
+            offset += record.size
+        tables[name] = (removed, upserts)
+    events = []
+    if mask & EVENTS_BIT:
+        (count,) = EVENT_COUNT.unpack_from(payload, offset)
+        offset += EVENT_COUNT.size
+        for _ in range(count):
+            events.append(EXPLOSION.unpack_from(payload, offset))
+            offset += EXPLOSION.size
+    return kind, tick, hud, tables, events, fleet
+
+
+class Scene:
+    """ Spectator-side copy of the game state, rebuilt from messages """
+    def __init__(self):
+        self.tick = 0
+        self.hud = None
+        self.tables = {name: {} for name, _ in TABLES}
+        self.synced = False
+
+    def apply(self, payload):
+        """ Applies one message and returns its explosion events """
+        kind, tick, hud, tables, events, fleet = decode_message(payload)
+        if kind == KEYFRAME:
+            for entities in self.tables.values():
+                entities.clear()
+            self.synced = True
+        elif not self.synced:
+            return []
+        self.tick = tick
+        if hud is not None:
+            self.hud = hud
+        if kind == DELTA:
+            for name in self.tables:
+                self.tables[name] = predict(self.tables[name], name, fleet)
+        for name, (removed, upserts) in tables.items():
+            entities = self.tables[name]
+            for wid in removed:
+                entities.pop(wid, None)
+            entities.update(upserts)
+        return events
+
+    def keyframe(self):
+        tables = {name: ((), list(entities.items())) for name, entities in self.tables.items()}
+        return encode_message(KEYFRAME, self.tick, self.hud, tables, [])
+
+
+class _IdTracker:
+    """ Hands out stable wire ids for live game objects """
+    def __init__(self):
+        self.live = {}  # id(obj) -> (obj, wire id); holding obj keeps id() unique
+        self.next_id = 0
+
+    def assign(self, objects):
+        live = {}
+        for obj in objects:
+            entry = self.live.get(id(obj))
+            if entry is None or entry[0] is not obj:
+                entry = (obj, self.next_id)
+                self.next_id = (self.next_id + 1) & 0xffff
+            live[id(obj)] = entry
+        self.live = live
+        return [(obj, wid) for obj, wid in live.values()]
+
+
+class StateEncoder:
+    """ Turns successive Game ticks into keyframe/delta messages """
+    def __init__(self, keyframe_interval=120):
+        self.keyframe_interval = keyframe_interval
+        self.tick = 0
+        self.prev_hud = None
+        self.prev = {name: {} for name, _ in TABLES}
+        self.trackers = {name: _IdTracker() for name, _ in TABLES}
+
+    def snapshot(self, game):
+        flags = ((FLAG_GAME_OVER if game.game_over else 0) |
+                 (FLAG_SHIELD if game.shield_active else 0) |
+                 (FLAG_MULTISHOT if game.multishot_active else 0) |
+                 (FLAG_SPEED if game.speed_boost_active else 0))
+        hud = (game.score, game.high_score, max(-128, min(127, game.lives)), game.level,
+               flags, int(game.ship_x), int(game.ship_y))
+
+        t = self.trackers
+        tables = {
+            "enemies": {wid: (e.rect.x, e.rect.y, int(e.row_y), ENEMY_STATES.index(e.state))
+                        for e, wid in t["enemies"].assign(game.enemies)},
+            "bullets": {wid: (b.x, b.y, b.w, b.h) for b, wid in t["bullets"].assign(game.bullets)},
+            "enemy_bullets": {wid: (b.x, b.y, b.w, b.h)
+                              for b, wid in t["enemy_bullets"].assign(game.enemy_bullets)},
+            "powerups": {wid: (p.rect.x, p.rect.y, POWERUP_TYPES.index(p.type))
+                         for p, wid in t["powerups"].assign(game.powerups)},
+            "boss": {wid: (b.rect.x, b.rect.y, max(0, b.hp), b.max_hp)
+                     for b, wid in t["boss"].assign([game.boss] if game.boss else [])},
+            "ufo": {wid: (u.rect.x, u.rect.y)
+                    for u, wid in t["ufo"].assign([game.ufo] if game.ufo else [])},
+        }
+        events = [(int(x), int(y), *color, min(255, int(intensity * 10)))
+                  for x, y, color, intensity in game.explosions[:255]]
+        return hud, tables, events
+
+    def fleet_step(self, enemies, wave_ticks):
+        """ The x and row step shared by most formation enemies this tick """
+        steps = {}
+        prev = self.prev["enemies"]
+        for wid, (x, _, row_y, state) in enemies.items():
+            old = prev.get(wid)
+            if old is not None and old[3] == 0 and state == 0:
+                step = (x - old[0], row_y - old[2])
+                steps[step] = steps.get(step, 0) + 1
+        if not steps:
+            return None
+        dx, row_dy = max(steps, key=steps.get)
+        return dx, row_dy, wave_ticks & 0xffffffff
+
+    def encode(self, game):
+        hud, tables, events = self.snapshot(game)
+        self.tick += 1
+        if self.tick % self.keyframe_interval == 1 or self.keyframe_interval == 1:
+            msg = encode_message(KEYFRAME, self.tick, hud,
+                                 {name: ((), list(cur.items())) for name, cur in tables.items()}, events)
+        else:
+            fleet = self.fleet_step(tables["enemies"], game.wave_ticks)
+            deltas = {}
+            for name, cur in tables.items():
+                # Compare against what the viewer will predict, not last tick
+                prev = predict(self.prev[name], name, fleet)
+                removed = [wid for wid in prev if wid not in cur]
+                upserts = [(wid, rec) for wid, rec in cur.items() if prev.get(wid) != rec]
+                deltas[name] = (removed, upserts)
+            msg = encode_message(DELTA, self.tick, hud if hud != self.prev_hud else None, deltas, events, fleet)
+        self.prev_hud = hud
+        self.prev = tables
+        return msg
+
+
+def remove_stale_socket(path):
+    """ Deletes a leftover Unix socket, refusing to touch anything that isn't one """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket; refusing to replace it")
+    os.unlink(path)
+
+
+class SpectatorServer:
+    """ Fans game state out to spectators from an asyncio loop on its own thread """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None,
+                 keyframe_interval=120, max_buffer=256 * 1024):
+        self.host = host
+        self.port = port if port is not None else DEFAULT_PORT
+        self.unix_path = unix_path
+        self.max_buffer = max_buffer
+        self.encoder = StateEncoder(keyframe_interval)
+        self.mirror = Scene()  # used to resync new and lagging clients
+        self.clients = {}      # writer -> needs keyframe
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+        self.error = None      # set if the server could not start
+        self.thread = None
+
+        self.ticks = 0
+        self.bytes_encoded = 0
+        self.keyframe_bytes = 0
+        self.keyframes = 0
+        self.bytes_sent = 0
+        self.skipped = 0
+        self.peak_clients = 0
+        self.publish_time = 0.0
+
+    def start(self):
+        """ Starts serving; raises whatever stopped the server from binding """
+        self.thread = threading.Thread(target=self._run, name="SpectatorServer", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            self.thread.join()
+            raise self.error
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            if self.unix_path:
+                remove_stale_socket(self.unix_path)
+                coro = asyncio.start_unix_server(self._on_client, path=self.unix_path)
+            else:
+                coro = asyncio.start_server(self._on_client, self.host, self.port)
+            self.server = self.loop.run_until_complete(coro)
+            if not self.unix_path:
+                self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as e:
+            self.error = e
+            self.loop.close()
+            return
+        finally:
+            self.ready.set()
+        self.loop.run_forever()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    async def _on_client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.clients[writer] = True
+        self.peak_clients = max(self.peak_clients, len(self.clients))
+        try:
+            # Spectators never send anything; this just waits for hang-up
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def publish(self, game):
+        """ Called by the game loop once per tick, after Game.update() """
+        start = time.perf_counter()
+        msg = self.encoder.encode(game)
+        self.ticks += 1
+        self.bytes_encoded += len(msg)
+        if msg[FRAME.size] == KEYFRAME:
+            self.keyframes += 1
+            self.keyframe_bytes += len(msg)
+        self.loop.call_soon_threadsafe(self._broadcast, msg)
+        self.publish_time += time.perf_counter() - start
+
+    def _broadcast(self, msg):
+        self.mirror.apply(memoryview(msg)[FRAME.size:])
+        resync = None
+        for writer, needs_keyframe in list(self.clients.items()):
+            if writer.is_closing():
+                self.clients.pop(writer, None)
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                # Slow spectator: skip deltas until it drains, then resync
+                self.clients[writer] = True
+                self.skipped += 1
+                continue
+            if needs_keyframe:
+                if resync is None:
+                    resync = self.mirror.keyframe()
+                writer.write(resync)
+                self.bytes_sent += len(resync)
+                self.clients[writer] = False
+            else:
+                writer.write(msg)
+                self.bytes_sent += len(msg)
+
+    def stop(self):
+        if self.thread and self.thread.is_alive():
+            def shutdown():
+                for writer in list(self.clients):
+                    writer.close()
+                self.loop.stop()
+            self.loop.call_soon_threadsafe(shutdown)
+            self.thread.join()
+        if self.unix_path and self.server is not None:
+            # Only clean up a socket we bound ourselves
+            try:
+                remove_stale_socket(self.unix_path)
+            except FileExistsError:
+                pass
+
+    def stats(self):
+        ticks = max(1, self.ticks)
+        deltas = max(1, self.ticks - self.keyframes)
+        return {
+            "ticks": self.ticks,
+            "bytes_per_tick": self.bytes_encoded / ticks,
+            "delta_bytes": (self.bytes_encoded - self.keyframe_bytes) / deltas,
+            "keyframe_bytes": self.keyframe_bytes / max(1, self.keyframes),
+            "bytes_sent": self.bytes_sent,
+            "skipped": self.skipped,
+            "peak_clients": self.peak_clients,
+            "publish_ms": self.publish_time / ticks * 1000,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Spectators: {s['peak_clients']} peak, {s['bytes_per_tick']:.1f} B/tick "
+                f"(delta {s['delta_bytes']:.1f} B, keyframe {s['keyframe_bytes']:.1f} B), "
+                f"{s['skipped']} skipped sends, {s['publish_ms']:.3f} ms/tick encode")
+
+
+# --- CONNECTION HELPERS ---
+
+def connect(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+    if unix_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(unix_path)
+    else:
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def read_messages(sock):
+    """ Yields message payloads from a blocking socket until it closes """
+    buf = bytearray()
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return
+        buf += chunk
+        offset = 0
+        while len(buf) - offset >= FRAME.size:
+            (length,) = FRAME.unpack_from(buf, offset)
+            end = offset + FRAME.size + length
+            if len(buf) < end:
+                break
+            yield bytes(buf[offset + FRAME.size:end])
+            offset = end
+        del buf[:offset]
+
+
+# --- VIEWER ---
+
+def run_viewer(host, port, unix_path):
+    import pygame
+    import game as g  # shares the window, fonts and sprites with the game
+
+    pygame.display.set_caption("Space Invaders: SPECTATOR")
+    for done, total in g.load_assets(sound=False):
+        g.draw_loading(done / total)
+    scene = Scene()
+    lock = threading.Lock()
+    pending = []
+    connected = [True]
+
+    def receive():
+        try:
+            sock = connect(host, port, unix_path)
+            for payload in read_messages(sock):
+                with lock:
+                    pending.extend(scene.apply(payload))
+        except OSError as e:
+            print(f"Spectator connection lost: {e}")
+        connected[0] = False
+
+    threading.Thread(target=receive, daemon=True).start()
+
+    particles, shockwaves = [], []
+    bg_y = 0
+    running = True
+    while running:
+        g.clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        with lock:
+            hud = scene.hud
+            tables = {name: list(entities.values()) for name, entities in scene.tables.items()}
+            events, pending[:] = pending[:], []
+
+        for x, y, r, gr, b, intensity in events:
+            shockwaves.append(g.Shockwave(x, y, (255, 255, 255)))
+            for _ in range(int(20 * intensity / 10)):
+                particles.append(g.Particle(x, y, (r, gr, b)))
+        particles = [p for p in particles if p.life > 0]
+        for p in particles: p.update()
+        shockwaves = [s for s in shockwaves if s.life > 0]
+        for s in shockwaves: s.update()
+
+        screen = g.screen
+        bg_y = (bg_y + 0.5) % g.HEIGHT
+        if g.bg_img:
+            screen.blit(g.bg_img, (0, bg_y))
+            screen.blit(g.bg_img, (0, bg_y - g.HEIGHT))
+        else:
+            screen.fill((10, 10, 30))
+        screen.blit(g.dark_overlay, (0, 0))
+
+        if hud is None:
+            msg = "WAITING FOR GAME..." if connected[0] else "NO GAME RUNNING"
+            screen.blit(g.get_font(36).render(msg, True, (200, 200, 200)), (g.WIDTH//2 - 130, g.HEIGHT//2))
+            pygame.display.flip()
+            continue
+
+        score, high_score, lives, level, flags, ship_x, ship_y = hud
+        if g.player_img: screen.blit(g.player_img, (ship_x, ship_y))
+        else: pygame.draw.rect(screen, (0, 255, 0), (ship_x, ship_y, 50, 50))
+        if flags & FLAG_SHIELD:
+            pygame.draw.circle(screen, (0, 100, 255), (ship_x+25, ship_y+25), 40, 2)
+
+        for x, y, hp, max_hp in tables["boss"]:
+            screen.blit(g.boss_img, (x, y))
+            pygame.draw.rect(screen, (50, 50, 50), (x, y - 15, 150, 10))
+            pygame.draw.rect(screen, (255, 0, 0), (x, y - 15, 150 * hp / max(1, max_hp), 10))
+        for x, y, _, _ in tables["enemies"]:
+            if g.enemy_img: screen.blit(g.enemy_img, (x, y))
+            else: pygame.draw.rect(screen, (255, 0, 0), (x, y, 40, 30))
+        for x, y in tables["ufo"]:
+            pygame.draw.ellipse(screen, (255, 0, 0), (x, y, 60, 30))
+            pygame.draw.ellipse(screen, (50, 255, 255), (x + 20, y - 5, 20, 15))
+        for x, y, kind in tables["powerups"]:
+            powerup = g.PowerUp(x, y)
+            powerup.type = POWERUP_TYPES[kind]
+            powerup.draw(screen)
+
+        color = (255, 255, 0) if flags & FLAG_MULTISHOT else (0, 255, 255)
+        for x, y, w, h in tables["bullets"]:
+            pygame.draw.rect(screen, color, (x, y, w, h))
+        for x, y, w, h in tables["enemy_bullets"]:
+            pygame.draw.rect(screen, (255, 50, 50), (x, y, w, h))
+
+        for s in shockwaves: s.draw(screen)
+        for p in particles: p.draw(screen)
+
+        screen.blit(g.get_font(36).render(f"SCORE: {score}", True, (255, 255, 255)), (10, 10))
+        screen.blit(g.get_font(36).render(f"HI-SCORE: {high_score}", True, (255, 215, 0)), (300, 10))
+        screen.blit(g.get_font(36).render(f"LEVEL: {level}", True, (0, 255, 0)), (g.WIDTH - 130, 10))
+        for i in range(max(0, lives)):
+            pygame.draw.polygon(screen, (200, 50, 50), [
+                (20 + i*30, 50), (30 + i*30, 70), (10 + i*30, 70)
+            ])
+        if flags & FLAG_GAME_OVER:
+            screen.blit(g.get_font(72).render("GAME OVER", True, (255, 0, 0)), (g.WIDTH//2 - 150, g.HEIGHT//2 - 50))
+
+        pygame.display.flip()
+
+    pygame.quit()
+
+
+# --- BENCHMARK ---
+
+async def _bench_client(host, port, counter, verify=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    buf = bytearray()
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            counter["bytes"] += len(chunk)
+            buf += chunk
+            offset = 0
+            while len(buf) - offset >= FRAME.size:
+                (length,) = FRAME.unpack_from(buf, offset)
+                end = offset + FRAME.size + length
+                if len(buf) < end:
+                    break
+                if verify is not None:
+                    verify.apply(bytes(buf[offset + FRAME.size:end]))
+                counter["messages"] += 1
+                offset = end
+            del buf[:offset]
+    finally:
+        writer.close()
+
+
+def _bench_round(g, clients, ticks):
+    server = SpectatorServer(port=0)
+    server.start()
+    verify = Scene()
+    counters = [{"bytes": 0, "messages": 0} for _ in range(clients)]
+    loop = asyncio.new_event_loop()
+    client_thread_ready = threading.Event()
+
+    def run_clients():
+        asyncio.set_event_loop(loop)
+        tasks = [loop.create_task(_bench_client(server.host, server.port, c, verify if i == 0 else None))
+                 for i, c in enumerate(counters)]
+        client_thread_ready.set()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    threading.Thread(target=run_clients, daemon=True).start()
+    client_thread_ready.wait()
+    deadline = time.time() + 10
+    while len(server.clients) < clients and time.time() < deadline:
+        time.sleep(0.01)
+
+    game = g.Game()
+    frame_budget = 1 / 60
+    late = 0
+    for i in range(ticks):
+        start = time.perf_counter()
+        if i % 8 == 0: game.shoot()
+        if game.game_over: game.reset_game()
+        game.update()
+        server.publish(game)
+        spent = time.perf_counter() - start
+        if spent > frame_budget: late += 1
+        else: time.sleep(frame_budget - spent)
+
+    time.sleep(0.5)  # let the last messages drain
+    in_sync = verify.tick == server.encoder.tick and verify.tables == server.mirror.tables
+    caught_up = sum(1 for c in counters if c["messages"] >= ticks)
+    server.stop()
+    stats = server.stats()
+    stats.update(clients=clients, caught_up=caught_up, late_ticks=late, in_sync=in_sync,
+                 ok=caught_up == clients and stats["skipped"] == 0 and in_sync and late < ticks // 20)
+    return stats
+
+
+def run_bench(ticks, client_counts):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import game as g
+
+    best = 0
+    for clients in client_counts:
+        s = _bench_round(g, clients, ticks)
+        print(f"{clients:5d} clients: {s['bytes_per_tick']:7.1f} B/tick "
+              f"(delta {s['delta_bytes']:.1f} B, keyframe {s['keyframe_bytes']:.1f} B), "
+              f"{s['caught_up']}/{clients} caught up, {s['skipped']} skipped, "
+              f"{s['late_ticks']} late ticks, in sync: {s['in_sync']} -> {'OK' if s['ok'] else 'FAIL'}")
+        if not s["ok"]:
+            break
+        best = clients
+    print(f"Max clients served at 60 ticks/s: {best}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Space Invaders spectator viewer and benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+    view = sub.add_parser("view", help="watch a game started with --spectate")
+    view.add_argument("--host", default="127.0.0.1")
+    view.add_argument("--port", type=int, default=DEFAULT_PORT)
+    view.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead")
+    bench = sub.add_parser("bench", help="measure bytes per tick and client fan-out on localhost")
+    bench.add_argument("--ticks", type=int, default=300)
+    bench.add_argument("--clients", default="1,10,50,100,200,400",
+                       help="comma separated client counts to try in order")
+    args = parser.parse_args()
+
+    if args.command == "view":
+        run_viewer(args.host, args.port, args.unix)
+    else:
+        run_bench(args.ticks, [int(n) for n in args.clients.split(",")])
+    sys.exit()
@@ -0,0 +1,93 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# --- STARTUP TIMING REPORT ---
+# Launches game.py / menu.py with `python -X importtime ... --startup-report`.
+# The scripts print "startup <event> <unix time>" lines as they reach each
+# milestone and then quit, and -X importtime writes the import breakdown to
+# stderr. Both are combined into one report per entry point.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EVENTS = [
+    ("start", "script start (interpreter + stdlib)"),
+    ("first_frame", "first frame"),
+    ("loaded", "assets loaded"),
+    ("game_frame", "first game frame"),
+]
+
+
+def parse_importtime(stderr):
+    """ Returns [(module, self us, cumulative us, depth)] from -X importtime output """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2  # 0 = not nested in another import
+            imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return imports
+
+
+def interpreter_imports(env):
+    """ Modules Python imports before any script runs (site, encodings, ...) """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                          env=env, capture_output=True, text=True, timeout=60)
+    return {name for name, _, _, _ in parse_importtime(proc.stderr)}
+
+
+def measure(script, env):
+    launch = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", script, "--startup-report"],
+                          cwd=HERE, env=env, capture_output=True, text=True, timeout=120)
+    stamps = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[0] == "startup":
+            stamps[parts[1]] = float(parts[2])
+    return launch, stamps, parse_importtime(proc.stderr), proc
+
+
+def report(script, env, top, baseline):
+    launch, stamps, imports, proc = measure(script, env)
+    imports = [i for i in imports if i[0] not in baseline]
+    print(f"{script}")
+    if not stamps:
+        print(f"  no startup report (exit code {proc.returncode})")
+        for line in proc.stderr.splitlines()[-5:]:
+            if not line.startswith("import time:"):
+                print(f"  {line}")
+        return
+
+    for event, label in EVENTS:
+        if event in stamps:
+            print(f"  {label:<40} {(stamps[event] - launch) * 1000:8.1f} ms")
+
+    total = sum(self_us for _, self_us, _, _ in imports)
+    print(f"  imports: {len(imports)} modules, {total / 1000:.1f} ms in total "
+          f"(excluding interpreter startup); slowest top-level:")
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: -i[2])
+    for name, _, cumulative_us, _ in top_level[:top]:
+        print(f"    {name:<36} {cumulative_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup timing for the Space Invaders entry points")
+    parser.add_argument("scripts", nargs="*", default=["menu.py", "game.py"])
+    parser.add_argument("--headless", action="store_true",
+                        help="use SDL's dummy video/audio drivers (game.py only; menu.py needs a display)")
+    parser.add_argument("--top", type=int, default=8, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.headless:
+        env.setdefault("SDL_VIDEODRIVER", "dummy")
+        env.setdefault("SDL_AUDIODRIVER", "dummy")
+    baseline = interpreter_imports(env)
+    for script in args.scripts:
+        report(script, env, args.top, baseline)